@@ -0,0 +1,212 @@
+import html
+from typing import Dict, Optional, Tuple
+from PyQt5.QtCore import QAbstractItemModel, QEvent, QModelIndex, pyqtSignal, pyqtSlot, QSize, Qt, QTimer
+from PyQt5.QtGui import QIcon, QPainter, QPalette, QStaticText, QTransform
+from PyQt5.QtWidgets import (QApplication, QComboBox, QStyle, QStyledItemDelegate, QStyleOptionButton,
+                             QStyleOptionComboBox, QStyleOptionViewItem, QWidget)
+from gui.filter_table_model import FilterTableModel
+
+
+def _get_style(option: QStyleOptionViewItem) -> QStyle:
+    """
+    Function returns style of widget for which item is drawn.
+    :param option: style option of item.
+    :return: style.
+    """
+
+    return option.widget.style() if option.widget else QApplication.style()
+
+
+class EnableFilterDelegate(QStyledItemDelegate):
+    """
+    Class for delegate to enable/disable filter in router.
+    """
+
+    STATES: Tuple[str, ...] = ("Вкл", "Выкл", "-")
+    filter_state_changed: pyqtSignal = pyqtSignal(QModelIndex, str)
+
+    def _get_style_option(self, option: QStyleOptionViewItem, index: QModelIndex) -> QStyleOptionComboBox:
+        """
+        Method returns style option to draw combo box in given cell.
+        :param option: style option of item;
+        :param index: index of item.
+        :return: style option for combo box.
+        """
+
+        style_option = QStyleOptionComboBox()
+        if option.widget:
+            style_option.initFrom(option.widget)
+        style_option.rect = option.rect
+        style_option.currentText = index.data(Qt.DisplayRole) or ""
+        if index.flags() & Qt.ItemIsEnabled and option.state & QStyle.State_Enabled:
+            style_option.state |= QStyle.State_Enabled
+        else:
+            style_option.state &= ~QStyle.State_Enabled
+            style_option.palette.setCurrentColorGroup(QPalette.Disabled)
+        return style_option
+
+    def createEditor(self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> QComboBox:
+        combo_box: QComboBox = QComboBox(parent)
+        combo_box.blockSignals(True)
+        combo_box.setEditable(True)
+        combo_box.lineEdit().setReadOnly(True)
+        combo_box.lineEdit().setAlignment(Qt.AlignCenter)
+        combo_box.addItems(self.STATES)
+        combo_box.blockSignals(False)
+        combo_box.textActivated.connect(self.commit_and_close_editor)
+        QTimer.singleShot(0, combo_box.showPopup)
+        return combo_box
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return
+        style = _get_style(option)
+        style_option = self._get_style_option(option, index)
+        style.drawComplexControl(QStyle.CC_ComboBox, style_option, painter, option.widget)
+        text_rect = style.subControlRect(QStyle.CC_ComboBox, style_option, QStyle.SC_ComboBoxEditField,
+                                         option.widget)
+        style.drawItemText(painter, text_rect, Qt.AlignCenter, style_option.palette,
+                           bool(style_option.state & QStyle.State_Enabled), style_option.currentText,
+                           QPalette.ButtonText)
+
+    def setEditorData(self, editor: QComboBox, index: QModelIndex) -> None:
+        editor.blockSignals(True)
+        editor.setCurrentText(index.data(Qt.DisplayRole))
+        editor.blockSignals(False)
+
+    def setModelData(self, editor: QComboBox, model: QAbstractItemModel, index: QModelIndex) -> None:
+        text = editor.currentText()
+        if text != index.data(Qt.DisplayRole) and model.setData(index, text, Qt.EditRole):
+            self.filter_state_changed.emit(index, text)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return super().sizeHint(option, index)
+        content_size = QSize(max(option.fontMetrics.horizontalAdvance(state) for state in self.STATES),
+                             option.fontMetrics.height())
+        return _get_style(option).sizeFromContents(QStyle.CT_ComboBox, self._get_style_option(option, index),
+                                                   content_size, option.widget)
+
+    def updateEditorGeometry(self, editor: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        editor.setGeometry(option.rect)
+
+    @pyqtSlot(str)
+    def commit_and_close_editor(self, _: str) -> None:
+        """
+        Slot commits selected filter state to model and closes combo box.
+        """
+
+        editor = self.sender()
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+
+class FilterLabelDelegate(QStyledItemDelegate):
+    """
+    Class for delegate to show data about filter.
+    """
+
+    MAX_COMMENT_LENGTH: int = 25
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        """
+        :param parent: parent widget.
+        """
+
+        super().__init__(parent)
+        self._static_texts: Dict[Tuple[str, str], QStaticText] = {}
+
+    def _get_static_text(self, option: QStyleOptionViewItem, index: QModelIndex) -> QStaticText:
+        """
+        Method returns text to show for filter. Text is laid out only once for each filter and comment.
+        :param option: style option of item;
+        :param index: index of filter.
+        :return: MAC address and target of filter and (if any) comment for filter in one rich text.
+        """
+
+        key = index.data(Qt.DisplayRole), index.data(FilterTableModel.COMMENT_ROLE) or ""
+        static_text = self._static_texts.get(key, None)
+        if static_text is None:
+            text = f"<span style='color: blue;'>{html.escape(key[0])}</span>"
+            if key[1]:
+                text += f"<br><span style='color: green;'>{html.escape(key[1][:self.MAX_COMMENT_LENGTH])}</span>"
+            static_text = QStaticText(f"<nobr>{text}</nobr>")
+            static_text.setTextFormat(Qt.RichText)
+            static_text.prepare(QTransform(), option.font)
+            self._static_texts[key] = static_text
+        return static_text
+
+    @pyqtSlot()
+    def clear_cache(self) -> None:
+        """
+        Slot removes texts of all filters laid out earlier.
+        """
+
+        self._static_texts.clear()
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return
+        painter.save()
+        painter.setFont(option.font)
+        painter.drawStaticText(option.rect.topLeft(), self._get_static_text(option, index))
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return super().sizeHint(option, index)
+        return self._get_static_text(option, index).size().toSize()
+
+
+class IconButtonDelegate(QStyledItemDelegate):
+    """
+    Class for delegate to show button with icon.
+    """
+
+    ICON_SIZE: QSize = QSize(16, 16)
+    clicked: pyqtSignal = pyqtSignal(QModelIndex)
+
+    def __init__(self, icon: QIcon, parent: Optional[QWidget] = None) -> None:
+        """
+        :param icon: icon for button;
+        :param parent: parent widget.
+        """
+
+        super().__init__(parent)
+        self._icon: QIcon = icon
+
+    def _get_style_option(self, option: QStyleOptionViewItem) -> QStyleOptionButton:
+        """
+        Method returns style option to draw button in given cell.
+        :param option: style option of item.
+        :return: style option for button.
+        """
+
+        style_option = QStyleOptionButton()
+        style_option.rect = option.rect
+        style_option.icon = self._icon
+        style_option.iconSize = self.ICON_SIZE
+        style_option.palette = option.palette
+        style_option.state = (option.state & (QStyle.State_Enabled | QStyle.State_MouseOver)) | QStyle.State_Raised
+        return style_option
+
+    def editorEvent(self, event: QEvent, model: QAbstractItemModel, option: QStyleOptionViewItem,
+                    index: QModelIndex) -> bool:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return False
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and
+                option.rect.contains(event.pos())):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return
+        _get_style(option).drawControl(QStyle.CE_PushButton, self._get_style_option(option), painter, option.widget)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        if index.row() < FilterTableModel.INITIAL_ROW_COUNT:
+            return super().sizeHint(option, index)
+        return _get_style(option).sizeFromContents(QStyle.CT_PushButton, self._get_style_option(option),
+                                                   self.ICON_SIZE, option.widget)
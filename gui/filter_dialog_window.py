@@ -1,11 +1,13 @@
 import os
-from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QDialog
-from PyQt5.uic import loadUi
+from PyQt5.uic import loadUiType
 from gui import utils as ut
 
 
-class FilterDialog(QDialog):
+_FilterDialogUi, _ = loadUiType(os.path.join(ut.DIR_MEDIA, "filter_params_dialog_window.ui"))
+
+
+class FilterDialog(QDialog, _FilterDialogUi):
     """
     Class for dialog window to set comment for filter.
     """
@@ -24,9 +26,9 @@ class FilterDialog(QDialog):
         Method initializes widgets on dialog window.
         """
 
-        loadUi(os.path.join(ut.DIR_MEDIA, "filter_params_dialog_window.ui"), self)
+        self.setupUi(self)
         self.setWindowTitle("Настройки фильтра")
-        self.setWindowIcon(QIcon(os.path.join(ut.DIR_MEDIA, "icon.png")))
+        self.setWindowIcon(ut.get_app_icon())
         self.line_edit_comment.setText(self._comment)
         self.line_edit_comment.returnPressed.connect(self.accept)
         self.button_ok.clicked.connect(self.accept)
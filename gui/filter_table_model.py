@@ -0,0 +1,353 @@
+import bisect
+from typing import Any, Dict, Generator, List, Optional, Tuple
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+_FILTER_ABSENT: int = 0
+_FILTER_ENABLED: int = 1
+_FILTER_DISABLED: int = 2
+_DISABLED_TO_STATE: Dict[str, int] = {"false": _FILTER_ENABLED,
+                                      "true": _FILTER_DISABLED}
+_STATE_TO_DISABLED: Tuple[str, ...] = ("", "false", "true")
+_STATE_TO_TEXT: Tuple[str, ...] = ("-", "Вкл", "Выкл")
+_TEXT_TO_DISABLED: Dict[str, str] = {"Вкл": "false",
+                                     "Выкл": "true"}
+
+
+class FilterTableModel(QAbstractTableModel):
+    """
+    Class for table model with filter statistics of routers. Filter states are stored as grid: one byte array for each
+    filter with one state for each router.
+    """
+
+    COMMENT_ROLE: int = Qt.UserRole + 1
+    ENABLED_STATE_ROLE: int = Qt.UserRole + 2
+    INITIAL_ROW_COUNT: int = 2
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._bad_routers: List[bool] = []
+        self._comments: List[str] = []
+        self._filters: List[Tuple[str, str]] = []
+        self._router_columns: Dict[str, int] = {}
+        self._router_ip_addresses: List[str] = []
+        self._states: List[bytearray] = []
+
+    @property
+    def delete_column(self) -> int:
+        """
+        :return: column with buttons to delete filters.
+        """
+
+        return max(len(self._router_ip_addresses), 1) + 1
+
+    @property
+    def distribute_column(self) -> int:
+        """
+        :return: column with buttons to distribute filters.
+        """
+
+        return max(len(self._router_ip_addresses), 1) + 2
+
+    @property
+    def router_count(self) -> int:
+        """
+        :return: number of routers in table.
+        """
+
+        return len(self._router_ip_addresses)
+
+    def _append_routers(self, routers: List[Tuple[str, Dict[Tuple[str, str], Dict[str, str]], bool]]) -> None:
+        """
+        Method appends routers with their filter statistics to data of table.
+        :param routers: list with IP addresses, filter statistics of routers and flags whether failed to connect to
+        routers.
+        """
+
+        for router_ip_address, router_statistics, bad_router in routers:
+            for mac_and_target, data in router_statistics.items():
+                position = self._find_filter(mac_and_target)
+                if position is None:
+                    self._insert_filter(mac_and_target, data.get("comment", None) or "")
+                elif data.get("comment", None) and not self._comments[position]:
+                    self._comments[position] = data["comment"]
+            for mac_and_target, states in zip(self._filters, self._states):
+                data = router_statistics.get(mac_and_target, None) or {}
+                states.append(_DISABLED_TO_STATE.get(data.get("disabled", None), _FILTER_ABSENT))
+            self._router_ip_addresses.append(router_ip_address)
+            self._bad_routers.append(bad_router)
+            self._router_columns[router_ip_address] = len(self._router_ip_addresses)
+
+    def _find_filter(self, mac_and_target: Tuple[str, str]) -> Optional[int]:
+        """
+        Method returns position of filter in sorted list of filters.
+        :param mac_and_target: MAC address and target (SRC or DST) of filter.
+        :return: position of filter or None if there is no such filter.
+        """
+
+        position = bisect.bisect_left(self._filters, mac_and_target)
+        if position < len(self._filters) and self._filters[position] == mac_and_target:
+            return position
+        return None
+
+    def _insert_filter(self, mac_and_target: Tuple[str, str], comment: str) -> int:
+        """
+        Method inserts new filter with empty states for all routers into data of table.
+        :param mac_and_target: MAC address and target (SRC or DST) of filter;
+        :param comment: comment for filter.
+        :return: position of new filter.
+        """
+
+        position = bisect.bisect_left(self._filters, mac_and_target)
+        self._filters.insert(position, mac_and_target)
+        self._comments.insert(position, comment)
+        self._states.insert(position, bytearray(len(self._router_ip_addresses)))
+        return position
+
+    def _is_router_column(self, column: int) -> bool:
+        return 1 <= column <= len(self._router_ip_addresses)
+
+    def add_filter(self, mac_address: str, target: str, comment: str = "") -> int:
+        """
+        Method adds new filter to all routers in table.
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment for filter.
+        :return: row of new filter.
+        """
+
+        row = bisect.bisect_left(self._filters, (mac_address, target)) + self.INITIAL_ROW_COUNT
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._insert_filter((mac_address, target), comment)
+        self.endInsertRows()
+        return row
+
+    def add_routers(self, routers: List[Tuple[str, Dict[Tuple[str, str], Dict[str, str]], bool]]) -> None:
+        """
+        Method adds new routers with their filter statistics to table. If routers do not have new filters, only
+        columns for new routers are inserted into table, otherwise table is rebuilt.
+        :param routers: list with IP addresses, filter statistics of routers and flags whether failed to connect to
+        routers.
+        """
+
+        if not routers:
+            return
+        new_filters_added = any(self._find_filter(mac_and_target) is None for _, statistics, _ in routers
+                                for mac_and_target in statistics)
+        if new_filters_added or not self._router_ip_addresses:
+            self.beginResetModel()
+            self._append_routers(routers)
+            self.endResetModel()
+        else:
+            first_column = len(self._router_ip_addresses) + 1
+            self.beginInsertColumns(QModelIndex(), first_column, first_column + len(routers) - 1)
+            self._append_routers(routers)
+            self.endInsertColumns()
+            if self._filters:
+                self.dataChanged.emit(self.index(self.INITIAL_ROW_COUNT, 0), self.index(self.rowCount() - 1, 0))
+
+    def clear(self) -> None:
+        """
+        Method removes all routers and filters from table.
+        """
+
+        self.beginResetModel()
+        self._bad_routers.clear()
+        self._comments.clear()
+        self._filters.clear()
+        self._router_columns.clear()
+        self._router_ip_addresses.clear()
+        self._states.clear()
+        self.endResetModel()
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.distribute_column + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() < self.INITIAL_ROW_COUNT:
+            return None
+        position = index.row() - self.INITIAL_ROW_COUNT
+        mac_address, target = self._filters[position]
+        column = index.column()
+        if column == 0:
+            if role == Qt.DisplayRole:
+                return f"{mac_address} {target}"
+            if role in (self.COMMENT_ROLE, Qt.ToolTipRole):
+                return self._comments[position]
+        elif self._is_router_column(column):
+            if role == Qt.DisplayRole:
+                return _STATE_TO_TEXT[self._states[position][column - 1]]
+            if role == self.ENABLED_STATE_ROLE:
+                return _STATE_TO_DISABLED[self._states[position][column - 1]]
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+        elif column == self.delete_column and role == Qt.ToolTipRole:
+            return f"Удалить фильтр {mac_address} {target} из всех коммутаторов"
+        elif column == self.distribute_column and role == Qt.ToolTipRole:
+            return f"Установить фильтр {mac_address} {target} на все коммутаторы"
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.row() >= self.INITIAL_ROW_COUNT and self._is_router_column(index.column()):
+            if self._bad_routers[index.column() - 1]:
+                return Qt.NoItemFlags
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
+
+    def get_column_for_router(self, router_ip_address: str) -> Optional[int]:
+        """
+        Method returns column for router with given IP address.
+        :param router_ip_address: router IP address.
+        :return: column.
+        """
+
+        return self._router_columns.get(router_ip_address)
+
+    def get_filter(self, row: int) -> Tuple[str, str, str]:
+        """
+        Method returns filter in given row.
+        :param row: row of filter.
+        :return: MAC address, target (SRC or DST) and comment of filter.
+        """
+
+        mac_address, target = self._filters[row - self.INITIAL_ROW_COUNT]
+        return mac_address, target, self._comments[row - self.INITIAL_ROW_COUNT]
+
+    def get_router(self, column: int) -> Tuple[str, bool]:
+        """
+        Method returns router in given column.
+        :param column: column of router.
+        :return: IP address of router and True if failed to connect to router.
+        """
+
+        return self._router_ip_addresses[column - 1], self._bad_routers[column - 1]
+
+    def get_routers_with_filter(self, row: int) -> Generator:
+        """
+        Method returns IP addresses of routers that have filter in given row.
+        :param row: row of filter.
+        :return: IP addresses of routers.
+        """
+
+        states = self._states[row - self.INITIAL_ROW_COUNT]
+        for ip_address, bad_router, state in zip(self._router_ip_addresses, self._bad_routers, states):
+            if not bad_router and state != _FILTER_ABSENT:
+                yield ip_address
+
+    def get_routers_without_filter(self, row: int) -> Generator:
+        """
+        Method returns IP addresses of routers that have not filter in given row.
+        :param row: row of filter.
+        :return: column for router in table and IP addresses of routers.
+        """
+
+        states = self._states[row - self.INITIAL_ROW_COUNT]
+        for column, (ip_address, bad_router, state) in enumerate(zip(self._router_ip_addresses, self._bad_routers,
+                                                                     states), start=1):
+            if not bad_router and state == _FILTER_ABSENT:
+                yield column, ip_address
+
+    def get_row_for_filter(self, mac_address: str, target: str) -> Optional[int]:
+        """
+        Method returns row for given filter.
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter.
+        :return: row.
+        """
+
+        position = self._find_filter((mac_address, target))
+        return None if position is None else position + self.INITIAL_ROW_COUNT
+
+    def has_filter(self, mac_address: str, target: str) -> bool:
+        """
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter.
+        :return: True if there is given filter in table.
+        """
+
+        return self._find_filter((mac_address, target)) is not None
+
+    def remove_filter(self, row: int) -> None:
+        """
+        Method removes filter in given row from table.
+        :param row: row of filter.
+        """
+
+        position = row - self.INITIAL_ROW_COUNT
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._filters[position]
+        del self._comments[position]
+        del self._states[position]
+        self.endRemoveRows()
+
+    def remove_router(self, router_ip_address: str) -> None:
+        """
+        Method removes router from table.
+        :param router_ip_address: IP address of router.
+        """
+
+        column = self.get_column_for_router(router_ip_address)
+        if column is None:
+            return
+        if len(self._router_ip_addresses) > 1:
+            self.beginRemoveColumns(QModelIndex(), column, column)
+            del self._router_ip_addresses[column - 1]
+            del self._bad_routers[column - 1]
+            for states in self._states:
+                del states[column - 1]
+            self._router_columns = {ip_address: column for column, ip_address in
+                                    enumerate(self._router_ip_addresses, start=1)}
+            self.endRemoveColumns()
+        else:
+            self.clear()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._filters) + self.INITIAL_ROW_COUNT
+
+    def set_comment(self, row: int, comment: str) -> None:
+        """
+        Method sets new comment for filter in given row. If comment has not changed, views are not notified.
+        :param row: row of filter;
+        :param comment: comment for filter.
+        """
+
+        position = row - self.INITIAL_ROW_COUNT
+        if self._comments[position] == comment:
+            return
+        self._comments[position] = comment
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def set_filter_state(self, router_ip_address: str, mac_address: str, target: str, comment: str, state: str
+                         ) -> None:
+        """
+        Method sets filter state for given router.
+        :param router_ip_address: router IP address;
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment for filter (comment is stored for filter, not for router);
+        :param state: filter state on router.
+        """
+
+        column = self.get_column_for_router(router_ip_address)
+        row = self.get_row_for_filter(mac_address, target)
+        if column is None or row is None:
+            return
+        self._states[row - self.INITIAL_ROW_COUNT][column - 1] = _DISABLED_TO_STATE.get(state, _FILTER_ABSENT)
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.EditRole) -> bool:
+        if role != Qt.EditRole or not (self.flags(index) & Qt.ItemIsEditable):
+            return False
+        state = _TEXT_TO_DISABLED.get(value, "-")
+        router_ip_address, _ = self.get_router(index.column())
+        mac_address, target, comment = self.get_filter(index.row())
+        self.set_filter_state(router_ip_address, mac_address, target, comment, state)
+        return True
@@ -1,11 +1,40 @@
+import logging
 import os
-from typing import Dict, List
-from PyQt5.QtCore import QCoreApplication, pyqtSlot, QPoint, Qt
-from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QAction, QFileDialog, QHeaderView, QLabel, QMenu, QTableWidget
+from contextlib import contextmanager
+from typing import Dict, Generator, List, Tuple
+from PyQt5.QtCore import QCoreApplication, pyqtSlot, QPoint, QRunnable, Qt, QThreadPool
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QAction, QFileDialog, QHeaderView, QMenu, QTableWidget, QTableWidgetItem
 from gui import utils as ut
 
 
+class LogFileWriter(QRunnable):
+    """
+    Class to write logs to file in thread pool.
+    """
+
+    def __init__(self, file_name: str, lines: List[str], buffer_size: int) -> None:
+        """
+        :param file_name: name of file for logs;
+        :param lines: lines with logs;
+        :param buffer_size: size of buffer for file writing.
+        """
+
+        super().__init__()
+        self._buffer_size: int = buffer_size
+        self._file_name: str = file_name
+        self._lines: List[str] = lines
+
+    def run(self) -> None:
+        try:
+            with open(self._file_name, "w", encoding="utf-8", buffering=self._buffer_size) as file:
+                file.writelines(self._lines)
+        except OSError as exc:
+            logging.error("Failed to save logs to file %s: %s", self._file_name, exc)
+        else:
+            logging.info("Logs were saved to file %s", self._file_name)
+
+
 class LogTable(QTableWidget):
     """
     Class for table widget to display logs.
@@ -18,26 +47,42 @@ class LogTable(QTableWidget):
                                         "UNKNOWN": "pink",
                                         "WARN": "orange",
                                         "WARNING": "orange"}
+    _FILE_BUFFER_SIZE: int = 1 << 18
     _HEADERS: List[str] = ["Время", "Статус", "Информация"]
+    _TEXT_MARGIN: int = 10
+    _TIME_SAMPLE: str = "0000-00-00 00:00:00,000"
 
     def __init__(self) -> None:
         super().__init__()
         self._dir_name: str = ut.get_dir_name()
+        self._menu: QMenu = QMenu(self)
+        self._init_menu()
         self._init_ui()
 
-    def _get_logs(self) -> str:
+    def _get_log_lines(self) -> Generator:
         """
-        Method returns logs from table.
-        :return: logs.
+        Method returns logs from table line by line.
+        :return: lines with logs.
         """
 
-        logs = ""
+        item = self.item
         for row in range(self.rowCount()):
-            log_time = self.cellWidget(row, 0).text()
-            level = self.cellWidget(row, 1).text()
-            message = self.cellWidget(row, 2).text()
-            logs += f"[{log_time} {level}] {message}\n"
-        return logs
+            yield "[%s %s] %s\n" % (item(row, 0).text(), item(row, 1).text(), item(row, 2).text())
+
+    def _init_menu(self) -> None:
+        """
+        Method creates context menu for table once.
+        """
+
+        action_copy = QAction(ut.get_icon("copy.png"), "Копировать", self._menu)
+        action_copy.triggered.connect(self.copy_logs)
+        self._menu.addAction(action_copy)
+        action_save = QAction(ut.get_icon("save.png"), "Сохранить", self._menu)
+        action_save.triggered.connect(self.save_logs)
+        self._menu.addAction(action_save)
+        action_clear = QAction(ut.get_icon("clear.png"), "Очистить", self._menu)
+        action_clear.triggered.connect(self.clear_logs)
+        self._menu.addAction(action_clear)
 
     def _init_ui(self) -> None:
         """
@@ -46,14 +91,42 @@ class LogTable(QTableWidget):
 
         self.setColumnCount(len(self._HEADERS))
         self.setHorizontalHeaderLabels(self._HEADERS)
-        for column in range(len(self._HEADERS)):
-            mode = QHeaderView.Stretch if column == 2 else QHeaderView.ResizeToContents
-            self.horizontalHeader().setSectionResizeMode(column, mode)
+        self._set_column_widths()
         self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.verticalHeader().hide()
         self.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
         self.horizontalHeader().customContextMenuRequested.connect(self.show_context_menu)
 
+    def _set_column_widths(self) -> None:
+        """
+        Method sets widths of columns with time and level of logs once, so that table does not measure all rows when
+        new log is added. Column with messages takes the rest of table width.
+        """
+
+        header = self.horizontalHeader()
+        samples = (self._TIME_SAMPLE,), tuple(self._COLORS_FOR_LOGS)
+        for column, texts in enumerate(samples):
+            width = max(self.fontMetrics().horizontalAdvance(text) for text in texts) + self._TEXT_MARGIN
+            header.setSectionResizeMode(column, QHeaderView.Interactive)
+            header.resizeSection(column, max(width, header.sectionSizeHint(column)))
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+
+    @contextmanager
+    def _bulk_update(self) -> Generator:
+        """
+        Context manager disables repainting and sorting of table while table is being changed.
+        """
+
+        sorting_enabled = self.isSortingEnabled()
+        self.setUpdatesEnabled(False)
+        self.setSortingEnabled(False)
+        try:
+            yield
+        finally:
+            self.setSortingEnabled(sorting_enabled)
+            self.setUpdatesEnabled(True)
+            self.viewport().update()
+
     @pyqtSlot(str, str, str)
     def add_log(self, log_time: str, level: str, message: str) -> None:
         """
@@ -63,19 +136,30 @@ class LogTable(QTableWidget):
         :param message: log message.
         """
 
-        row_count = self.rowCount()
-        self.setRowCount(row_count + 1)
-        for column, text in enumerate((log_time, level, message)):
-            label = QLabel(text)
-            if column == 1:
-                label.setAlignment(Qt.AlignCenter)
-                label.setStyleSheet(f"color: {self._COLORS_FOR_LOGS.get(level, 'UNKNOWN')}")
-            label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-            self.setCellWidget(row_count, column, label)
+        self.add_logs([(log_time, level, message)])
+
+    @pyqtSlot(list)
+    def add_logs(self, logs: List[Tuple[str, str, str]]) -> None:
+        """
+        Slot adds new entries to the table. Rows for all entries are allocated at once.
+        :param logs: list with time, level and message of logs.
+        """
+
+        if not logs:
+            return
+        with self._bulk_update():
+            row_count = self.rowCount()
+            self.setRowCount(row_count + len(logs))
+            for row, (log_time, level, message) in enumerate(logs, start=row_count):
+                color = self._COLORS_FOR_LOGS.get(level, self._COLORS_FOR_LOGS["UNKNOWN"])
+                for column, text in enumerate((log_time, level, message)):
+                    item = QTableWidgetItem(text)
+                    if column == 1:
+                        item.setTextAlignment(Qt.AlignCenter)
+                        item.setForeground(QBrush(QColor(color)))
+                    item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+                    self.setItem(row, column, item)
         self.scrollToBottom()
-        for column in range(len(self._HEADERS)):
-            mode = QHeaderView.Stretch if column == 2 else QHeaderView.ResizeToContents
-            self.horizontalHeader().setSectionResizeMode(column, mode)
 
     @pyqtSlot()
     def clear_logs(self) -> None:
@@ -83,8 +167,8 @@ class LogTable(QTableWidget):
         Slot to clear logs in table.
         """
 
-        while self.rowCount() > 0:
-            self.removeRow(self.rowCount() - 1)
+        with self._bulk_update():
+            self.setRowCount(0)
 
     @pyqtSlot()
     def copy_logs(self) -> None:
@@ -92,20 +176,20 @@ class LogTable(QTableWidget):
         Slot to copy all logs.
         """
 
-        QCoreApplication.instance().clipboard().setText(self._get_logs())
+        QCoreApplication.instance().clipboard().setText("".join(self._get_log_lines()))
 
     @pyqtSlot()
     def save_logs(self) -> None:
         """
-        Slot to save all logs to file.
+        Slot to save all logs to file. Logs are written to file in thread pool, so that window is not blocked.
         """
 
         file_name = os.path.join(self._dir_name, "logs.txt")
         file_name = QFileDialog.getSaveFileName(self, "Сохранить в файл", file_name, filter="Text file (*.txt)")[0]
         if file_name:
             self._dir_name = os.path.dirname(file_name)
-            with open(file_name, "w", encoding="utf-8") as file:
-                file.write(self._get_logs())
+            writer = LogFileWriter(file_name, list(self._get_log_lines()), self._FILE_BUFFER_SIZE)
+            QThreadPool.globalInstance().start(writer)
 
     @pyqtSlot(QPoint)
     def show_context_menu(self, position: QPoint) -> None:
@@ -114,14 +198,4 @@ class LogTable(QTableWidget):
         :param position: position to show context.
         """
 
-        menu = QMenu(self)
-        action_copy = QAction(QIcon(os.path.join(ut.DIR_MEDIA, "copy.png")), "Копировать")
-        action_copy.triggered.connect(self.copy_logs)
-        menu.addAction(action_copy)
-        action_save = QAction(QIcon(os.path.join(ut.DIR_MEDIA, "save.png")), "Сохранить")
-        action_save.triggered.connect(self.save_logs)
-        menu.addAction(action_save)
-        action_clear = QAction(QIcon(os.path.join(ut.DIR_MEDIA, "clear.png")), "Очистить")
-        action_clear.triggered.connect(self.clear_logs)
-        menu.addAction(action_clear)
-        menu.exec_(self.horizontalHeader().mapToGlobal(position))
+        self._menu.exec_(self.horizontalHeader().mapToGlobal(position))
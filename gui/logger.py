@@ -1,25 +1,79 @@
 import logging
-from PyQt5.QtCore import pyqtSignal, QObject
+import threading
+from typing import List, Tuple
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QCoreApplication, QObject, QTimer
 
 
 class LoggingHandler(logging.Handler):
     """
-    Class to send logs from logging module by PyQt5 signals.
+    Class to send logs from logging module by PyQt5 signals. Logs are collected and sent in batches.
     """
 
     class LoggingForwarder(QObject):
-        log_received: pyqtSignal = pyqtSignal(str, str, str)
+        """
+        Class collects logs from any thread and sends them in batch from thread of object.
+        """
+
+        FLUSH_DELAY: int = 50
+        logs_added: pyqtSignal = pyqtSignal()
+        logs_received: pyqtSignal = pyqtSignal(list)
+
+        def __init__(self) -> None:
+            super().__init__()
+            self._buffer: List[Tuple[str, str, str]] = []
+            self._lock: threading.Lock = threading.Lock()
+            self._timer: QTimer = QTimer(self)
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(self.FLUSH_DELAY)
+            self._timer.timeout.connect(self.flush)
+            self.logs_added.connect(self.start_timer)
+
+        def add_log(self, log_time: str, level: str, message: str) -> None:
+            """
+            Method adds log to batch. Timer to send batch is started when first log is added to batch.
+            :param log_time: log time;
+            :param level: log level;
+            :param message: log message.
+            """
+
+            with self._lock:
+                self._buffer.append((log_time, level, message))
+                first_log = len(self._buffer) == 1
+            if first_log:
+                self.logs_added.emit()
+
+        @pyqtSlot()
+        def flush(self) -> None:
+            """
+            Slot sends all collected logs.
+            """
+
+            with self._lock:
+                logs, self._buffer = self._buffer, []
+            if logs:
+                self.logs_received.emit(logs)
+
+        @pyqtSlot()
+        def start_timer(self) -> None:
+            """
+            Slot starts timer to send collected logs. If there is no application yet, logs are sent at once.
+            """
+
+            if QCoreApplication.instance() is None:
+                self.flush()
+            elif not self._timer.isActive():
+                self._timer.start()
 
     def __init__(self) -> None:
         super().__init__()
         self._forwarder: self.LoggingForwarder = self.LoggingForwarder()
 
     @property
-    def log_received(self) -> pyqtSignal:
-        return self._forwarder.log_received
+    def logs_received(self) -> pyqtSignal:
+        return self._forwarder.logs_received
 
     def emit(self, record: logging.LogRecord) -> None:
-        self._forwarder.log_received.emit(record.asctime, record.levelname, record.message)
+        self._forwarder.add_log(record.asctime, record.levelname, record.message)
 
 
 formatter = logging.Formatter("[%(asctime)s - %(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
@@ -1,8 +1,8 @@
-import ipaddress
 import logging
 import os
+from typing import Optional
 from PyQt5.QtCore import pyqtSignal, pyqtSlot, QRegExp, QThread
-from PyQt5.QtGui import QCloseEvent, QIcon, QRegExpValidator
+from PyQt5.QtGui import QCloseEvent, QRegExpValidator
 from PyQt5.QtWidgets import QMainWindow
 from PyQt5.uic import loadUi
 from gui import utils as ut
@@ -13,6 +13,8 @@ from gui.router_dialog_window import DialogMode, RouterDialog
 from mikrotik import Routers
 
 
+_IP_ADDRESS_REG_EXP: QRegExp = QRegExp(r"^(\d{1,3}\.){3}(\d{1,3})$")
+_MAC_ADDRESS_REG_EXP: QRegExp = QRegExp(r"^([0-9A-Fa-f]{2}[:]){5}([0-9A-Fa-f]{2}) (SRC|src|DST|dst)$")
 logger = logging.getLogger()
 formatter = logging.Formatter("[%(asctime)s - %(levelname)s] %(message)s")
 logging_forwarder = LoggingHandler()
@@ -36,6 +38,7 @@ class MainWindow(QMainWindow):
         self._dialog_window: RouterDialog = RouterDialog()
         self._routers: Routers = Routers()
         self._thread: QThread = QThread(parent=self)
+        self._widgets_enabled: Optional[bool] = None
         self._thread.setTerminationEnabled(True)
         self._routers.moveToThread(self._thread)
         self._init_ui()
@@ -51,10 +54,9 @@ class MainWindow(QMainWindow):
 
         if not self.line_edit_router_ip_address.hasAcceptableInput():
             return False
-        try:
-            ipaddress.ip_address(self.line_edit_router_ip_address.text())
-        except ValueError:
-            return False
+        for part in self.line_edit_router_ip_address.text().split("."):
+            if int(part) > 255 or (len(part) > 1 and part.startswith("0")):
+                return False
         return True
 
     def _connect_signals(self) -> None:
@@ -62,7 +64,7 @@ class MainWindow(QMainWindow):
         Method to connect all signals between different objects.
         """
 
-        logging_forwarder.log_received.connect(self.log_table.add_log)
+        logging_forwarder.logs_received.connect(self.log_table.add_logs)
         self.filter_table.comment_should_be_added.connect(self._routers.add_comment_to_filter)
         self.filter_table.dialog_window_should_be_displayed.connect(self._routers.collect_data_for_dialog_window)
         self.filter_table.dialog_window_should_be_displayed.connect(self.show_dialog_window)
@@ -91,18 +93,18 @@ class MainWindow(QMainWindow):
 
         loadUi(os.path.join(ut.DIR_MEDIA, "main_window.ui"), self)
         self.setWindowTitle("MiFiSToFEL")
-        self.setWindowIcon(QIcon(os.path.join(ut.DIR_MEDIA, "icon.png")))
+        self.setWindowIcon(ut.get_app_icon())
         self.vertical_layout_for_filter_table.addWidget(self.filter_table)
         self.vertical_layout_for_log_table.addWidget(self.log_table)
 
         self.action_router_params.triggered.connect(self._routers.collect_data_for_dialog_window)
         self.action_router_params.triggered.connect(lambda: self.show_dialog_window(DialogMode.ALL, ""))
-        mac_address_validator = QRegExpValidator(QRegExp(r"^([0-9A-Fa-f]{2}[:]){5}([0-9A-Fa-f]{2}) (SRC|src|DST|dst)$"))
+        mac_address_validator = QRegExpValidator(_MAC_ADDRESS_REG_EXP, self.line_edit_mac_address)
         self.line_edit_mac_address.setValidator(mac_address_validator)
         self.line_edit_mac_address.returnPressed.connect(self.add_mac_address)
         self.line_edit_mac_address.textChanged.connect(self.check_line_edit)
         self.button_add_mac_address.clicked.connect(self.add_mac_address)
-        ip_address_validator = QRegExpValidator(QRegExp(r"^(\d{1,3}\.){3}(\d{1,3})$"))
+        ip_address_validator = QRegExpValidator(_IP_ADDRESS_REG_EXP, self.line_edit_router_ip_address)
         self.line_edit_router_ip_address.setValidator(ip_address_validator)
         self.line_edit_router_ip_address.returnPressed.connect(self.add_router_ip_address)
         self.line_edit_router_ip_address.textChanged.connect(self.check_line_edit)
@@ -161,14 +163,18 @@ class MainWindow(QMainWindow):
     @pyqtSlot(bool)
     def enable_widgets(self, enable: bool) -> None:
         """
-        Slot enables or disables widgets.
+        Slot enables or disables widgets. Nothing is done if widgets are already in required state.
         :param enable: if True widgets will be enabled.
         """
 
+        if enable == self._widgets_enabled:
+            return
+        self._widgets_enabled = enable
+        self.setUpdatesEnabled(False)
         for widget in (self.filter_table, self.button_add_mac_address, self.button_add_router_ip_address,
                        self.line_edit_mac_address, self.line_edit_router_ip_address):
             widget.setEnabled(enable)
-            widget.update()
+        self.setUpdatesEnabled(True)
 
     @pyqtSlot(DialogMode, str)
     def show_dialog_window(self, mode: DialogMode, router_ip_address: str) -> None:
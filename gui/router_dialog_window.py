@@ -3,7 +3,6 @@ from enum import auto, Enum
 from typing import Dict, List
 from PyQt5.uic import loadUi
 from PyQt5.QtCore import pyqtSignal, pyqtSlot
-from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QComboBox, QDialog, QLayout
 from gui import utils as ut
 
@@ -26,6 +25,7 @@ class RouterDialog(QDialog):
         self._default_data: Dict[str, str] = {}
         self._mode: DialogMode = None
         self._routers: List[Dict[str, str]] = []
+        self._routers_by_ip_address: Dict[str, Dict[str, str]] = {}
         self._router_ip_address: str = ""
         self._init_ui()
 
@@ -36,7 +36,7 @@ class RouterDialog(QDialog):
 
         loadUi(os.path.join(ut.DIR_MEDIA, "router_params_dialog_window.ui"), self)
         self.setWindowTitle("Настройки коммутаторов")
-        self.setWindowIcon(QIcon(os.path.join(ut.DIR_MEDIA, "icon.png")))
+        self.setWindowIcon(ut.get_app_icon())
         self._set_default_user_and_password()
         self.combo_box_ip_addresses.setSizeAdjustPolicy(QComboBox.AdjustToContents)
         self.combo_box_ip_addresses.lineEdit().setReadOnly(True)
@@ -55,12 +55,24 @@ class RouterDialog(QDialog):
 
     def _set_routers_data(self) -> None:
         """
-        Method sets routers data to widgets.
+        Method sets routers data to widgets. Only IP addresses that have been added or removed are changed in combo
+        box.
         """
 
-        ip_addresses = [str(router.get("ip_address", "")) for router in self._routers]
-        self.combo_box_ip_addresses.clear()
-        self.combo_box_ip_addresses.addItems(ip_addresses)
+        combo_box = self.combo_box_ip_addresses
+        combo_box.blockSignals(True)
+        for index in reversed(range(combo_box.count())):
+            if combo_box.itemText(index) not in self._routers_by_ip_address:
+                combo_box.removeItem(index)
+        for index, ip_address in enumerate(self._routers_by_ip_address):
+            if combo_box.itemText(index) == ip_address:
+                continue
+            old_index = combo_box.findText(ip_address)
+            if old_index >= 0:
+                combo_box.removeItem(old_index)
+            combo_box.insertItem(index, ip_address)
+        combo_box.blockSignals(False)
+        self.set_params_for_router(self.combo_box_ip_addresses.currentText())
         self.group_box_router.setEnabled(bool(self._routers))
 
     @pyqtSlot()
@@ -71,11 +83,10 @@ class RouterDialog(QDialog):
 
         self._default_data = {"user": self.line_edit_default_user_name.text(),
                               "password": self.line_edit_default_password.text()}
-        for router in self._routers:
-            if str(router.get("ip_address", "")) == self.combo_box_ip_addresses.currentText():
-                router["user"] = self.line_edit_user_name.text() if self.line_edit_user_name.text() else None
-                router["password"] = self.line_edit_password.text() if self.line_edit_password.text() else None
-                break
+        router = self._routers_by_ip_address.get(self.combo_box_ip_addresses.currentText(), None)
+        if router is not None:
+            router["user"] = self.line_edit_user_name.text() if self.line_edit_user_name.text() else None
+            router["password"] = self.line_edit_password.text() if self.line_edit_password.text() else None
         self.new_data_should_be_set.emit(self._default_data, self._routers)
         self.close()
 
@@ -89,6 +100,7 @@ class RouterDialog(QDialog):
 
         self._default_data = default_data
         self._routers = routers
+        self._routers_by_ip_address = {str(router.get("ip_address", "")): router for router in routers}
         self._set_default_user_and_password()
         self._set_routers_data()
         if self._mode is DialogMode.SINGLE:
@@ -103,11 +115,10 @@ class RouterDialog(QDialog):
 
         user = ""
         password = ""
-        for router in self._routers:
-            if router_ip_address == str(router.get("ip_address", "")):
-                user = router.get("user", self._default_data.get("user", ""))
-                password = router.get("password", self._default_data.get("password", ""))
-                break
+        router = self._routers_by_ip_address.get(router_ip_address, None)
+        if router is not None:
+            user = router.get("user", self._default_data.get("user", ""))
+            password = router.get("password", self._default_data.get("password", ""))
         self.line_edit_user_name.setText(user)
         self.line_edit_password.setText(password)
 
@@ -1,12 +1,22 @@
 import os
 import sys
-from PyQt5.QtGui import QIcon
+from functools import lru_cache
+from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache
 from PyQt5.QtWidgets import QMessageBox
 
 
 DIR_MEDIA: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "media")
 
 
+def get_app_icon() -> QIcon:
+    """
+    Function returns icon of application.
+    :return: icon.
+    """
+
+    return get_icon("icon.png")
+
+
 def get_dir_name() -> str:
     """
     Function returns path to directory with executable file or code files.
@@ -20,6 +30,35 @@ def get_dir_name() -> str:
     return path
 
 
+@lru_cache(maxsize=None)
+def get_icon(file_name: str) -> QIcon:
+    """
+    Function returns icon from media directory. Icon is created only once and uses shared pixmap.
+    :param file_name: name of icon file in media directory.
+    :return: icon.
+    """
+
+    icon = QIcon()
+    icon.addPixmap(get_pixmap(file_name))
+    return icon
+
+
+def get_pixmap(file_name: str) -> QPixmap:
+    """
+    Function returns pixmap from media directory. Pixmap is decoded from file once and then is taken from pixmap
+    cache, so all icons with this image share the same pixmap data.
+    :param file_name: name of image file in media directory.
+    :return: pixmap.
+    """
+
+    key = f"media/{file_name}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None or pixmap.isNull():
+        pixmap = QPixmap(os.path.join(DIR_MEDIA, file_name))
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
 def show_exception(msg_title: str, msg_text: str, exc: str = "") -> None:
     """
     Function shows message box with error.
@@ -31,7 +70,7 @@ def show_exception(msg_title: str, msg_text: str, exc: str = "") -> None:
     msg_box = QMessageBox()
     msg_box.setIcon(QMessageBox.Warning)
     msg_box.setWindowTitle(msg_title)
-    msg_box.setWindowIcon(QIcon(os.path.join(DIR_MEDIA, "icon.png")))
+    msg_box.setWindowIcon(get_app_icon())
     msg_box.setText(msg_text)
     if exc:
         msg_box.setInformativeText(str(exc)[-500:])
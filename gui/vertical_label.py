@@ -1,5 +1,6 @@
-from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QPainter, QPaintEvent
+from typing import Optional
+from PyQt5.QtCore import QEvent, QPointF, QSize
+from PyQt5.QtGui import QPainter, QPaintEvent, QStaticText
 from PyQt5.QtWidgets import QLabel
 
 
@@ -12,18 +13,38 @@ class VerticalLabel(QLabel):
 
     def __init__(self, *args) -> None:
         QLabel.__init__(self, *args)
+        self._minimum_size_hint: Optional[QSize] = None
+        self._size_hint: Optional[QSize] = None
+        self._static_text: QStaticText = QStaticText(self.text())
+
+    def changeEvent(self, event: QEvent) -> None:
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._minimum_size_hint = None
+            self._size_hint = None
+        QLabel.changeEvent(self, event)
 
     def paintEvent(self, event: QPaintEvent) -> None:
         painter = QPainter(self)
         painter.translate(0, self.height())
         painter.rotate(-90)
-        painter.drawText(0, self.width() // 2, self.text())
+        painter.drawStaticText(QPointF(0, self.width() // 2 - self.fontMetrics().ascent()), self._static_text)
         painter.end()
 
     def minimumSizeHint(self) -> QSize:
-        size = QLabel.minimumSizeHint(self)
-        return QSize(size.height(), size.width())
+        if self._minimum_size_hint is None:
+            size = QLabel.minimumSizeHint(self)
+            self._minimum_size_hint = QSize(size.height(), size.width())
+        return self._minimum_size_hint
+
+    def setText(self, text: str) -> None:
+        QLabel.setText(self, text)
+        self._minimum_size_hint = None
+        self._size_hint = None
+        self._static_text.setText(text)
+        self.updateGeometry()
 
     def sizeHint(self) -> QSize:
-        size = QLabel.sizeHint(self)
-        return QSize(size.height(), size.width())
+        if self._size_hint is None:
+            size = QLabel.sizeHint(self)
+            self._size_hint = QSize(size.height(), size.width())
+        return self._size_hint
@@ -1,51 +1,121 @@
 import ipaddress
 import logging
 import os
+import re
 from configparser import ConfigParser
-from typing import Dict, List, Tuple
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
 from gui.utils import get_dir_name
 
 
 CONFIG_PATH: str = os.path.join(get_dir_name(), "config.ini")
 DEFAULT_CONFIG_DATA: Dict[str, str] = {"user": "admin",
                                        "password": "12345"}
+_IPV4_ADDRESS_REG_EXP: Pattern = re.compile(r"\.".join([r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"] * 4) + "$")
+_OPTION_REG_EXP: Pattern = re.compile(r"^([^=:]+?)\s*[=:]\s*(.*)$")
+_SECTION_REG_EXP: Pattern = re.compile(r"^\[(.+)\]$")
+_config_cache: Optional[Tuple[float, Dict[str, Dict[str, str]]]] = None
 
 
-def _read_default_user_and_password(config_parser: ConfigParser) -> Dict[str, str]:
+def _get_config() -> Dict[str, Dict[str, str]]:
+    """
+    Function returns parsed config file. Parsed config is cached until modification time of config file changes.
+    :return: dictionary with sections of config file and options in them.
+    """
+
+    global _config_cache
+    try:
+        modification_time = os.path.getmtime(CONFIG_PATH)
+    except OSError:
+        return {}
+    if _config_cache is not None and _config_cache[0] == modification_time:
+        return _config_cache[1]
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as file:
+            config = _parse_config(file.read().splitlines())
+    except Exception:
+        logging.error("Failed to read config file")
+        return {}
+    _config_cache = modification_time, config
+    return config
+
+
+def _parse_ip_address(text: str) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
+    """
+    Function converts name of section to IP address. Usual IPv4 addresses are checked with regular expression and are
+    created directly from bytes, other addresses are parsed by ipaddress module.
+    :param text: name of section.
+    :return: IP address or None if name of section is not IP address.
+    """
+
+    match = _IPV4_ADDRESS_REG_EXP.match(text)
+    if match:
+        return ipaddress.IPv4Address(bytes(map(int, match.groups())))
+    try:
+        return ipaddress.ip_address(text)
+    except ValueError:
+        return None
+
+
+def _parse_config(lines: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Function parses lines of config file. Config file consists of sections with options "key = value", so there is no
+    need in interpolation, default section and multiline values of ConfigParser.
+    :param lines: lines of config file.
+    :return: dictionary with sections of config file and options in them.
+    """
+
+    config = {}
+    section = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        match = _SECTION_REG_EXP.match(line)
+        if match:
+            section = config.setdefault(match.group(1), {})
+            continue
+        match = _OPTION_REG_EXP.match(line)
+        if match and section is not None:
+            section[match.group(1).lower()] = match.group(2)
+    return config
+
+
+def _read_default_user_and_password(config: Dict[str, Dict[str, str]]) -> Dict[str, str]:
     """
     Function reads default username and password for routers.
-    :param config_parser: config parser.
+    :param config: dictionary with sections of config file.
     :return: dictionary with default username and password.
     """
 
-    if not config_parser.has_section("MAIN"):
+    main_section = config.get("MAIN", None)
+    if main_section is None:
         logging.warning("There are no default user name and password in config file")
-        config_parser.add_section("MAIN")
+        main_section = {}
     _default_data = {}
     for subsection in ("user", "password"):
-        _default_data[subsection] = config_parser.get("MAIN", subsection,
-                                                      fallback=DEFAULT_CONFIG_DATA[subsection])
+        _default_data[subsection] = main_section.get(subsection, DEFAULT_CONFIG_DATA[subsection])
     return _default_data
 
 
-def _read_routers_from_config(config_parser: ConfigParser) -> List[Dict[str, str]]:
+def _read_routers_from_config(config: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
     """
     Function reads router parameters from config file.
-    :param config_parser: config parser.
+    :param config: dictionary with sections of config file.
     :return: list of dictionaries with routers data.
     """
 
     data = []
-    for section in config_parser.sections():
-        try:
-            ip_address = ipaddress.ip_address(section)
-        except Exception:
+    for section, options in config.items():
+        ip_address = _parse_ip_address(section)
+        if ip_address is None:
             continue
         router_data = {"ip_address": ip_address,
-                       "user": config_parser.get(section, "user", fallback=None),
-                       "password": config_parser.get(section, "password", fallback=None)}
+                       "user": options.get("user", None),
+                       "password": options.get("password", None)}
         data.append(router_data)
-    return sorted(data, key=lambda x: x["ip_address"])
+    data.sort(key=itemgetter("ip_address"))
+    return data
 
 
 def _save_default_to_config_file(config_parser: ConfigParser, default_data: Dict[str, str]) -> None:
@@ -80,15 +150,11 @@ def read_config_file() -> Tuple[Dict[str, str], List[Dict[str, str]]]:
     """
     Function reads config file.
     :return: dictionary with default username and password and
-    list of dictionaries with routers data.
+    list of dictionaries with routers data. Config file is parsed again only if it was modified since last reading.
     """
 
-    config_parser = ConfigParser()
-    try:
-        config_parser.read(CONFIG_PATH)
-    except Exception:
-        logging.error("Failed to read config file")
-    return _read_default_user_and_password(config_parser), _read_routers_from_config(config_parser)
+    config = _get_config()
+    return _read_default_user_and_password(config), _read_routers_from_config(config)
 
 
 def save_config_file(default_data: Dict[str, str], routers: List[Dict[str, str]]) -> None:
@@ -98,9 +164,11 @@ def save_config_file(default_data: Dict[str, str], routers: List[Dict[str, str]]
     :param routers: list of dictionaries with routers data.
     """
 
-    config_parser = ConfigParser()
+    global _config_cache
+    config_parser = ConfigParser(interpolation=None)
     _save_default_to_config_file(config_parser, default_data)
     _save_routers_to_config_file(config_parser, routers)
     with open(CONFIG_PATH, "w", encoding="utf-8") as file:
         config_parser.write(file)
+    _config_cache = None
     logging.debug("Routers data saved to config file")
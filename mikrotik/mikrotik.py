@@ -1,7 +1,35 @@
+import codecs
 import logging
-from typing import Dict, List, Optional, Tuple
-import chardet
-import ros_api
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    import ros_api
+
+
+@lru_cache(maxsize=256)
+def _detect_encoding(text: bytes) -> Optional[str]:
+    """
+    Function detects encoding of text. Results are cached, because the same comments come from routers with every
+    statistics.
+    :param text: bytes of text.
+    :return: name of encoding.
+    """
+
+    import chardet
+
+    return chardet.detect(text)["encoding"]
+
+
+class FilterData(NamedTuple):
+    """
+    Class with data of filter received from router.
+    """
+
+    action: str
+    disabled: str
+    comment: str
+    mac: str
+    target: str
 
 
 class MikroTikRouter:
@@ -10,15 +38,36 @@ class MikroTikRouter:
     """
 
     TIMEOUT: float = 0.5
+    _ADD_COMMAND: Tuple[str, ...] = "/interface/bridge/filter/add", "=action=accept", "=chain=forward"
+    _COMMENT_COMMAND: str = "/interface/bridge/filter/comment"
+    _ENABLE_COMMAND: str = "/interface/bridge/filter/{}"
+    _MOVE_COMMAND: str = "/interface/bridge/filter/move"
+    _PRINT_COMMAND: Tuple[str, ...] = ("/interface/bridge/filter/print",
+                                       "=.proplist=action,comment,disabled,dst-mac-address,src-mac-address")
+    _REMOVE_COMMAND: str = "/interface/bridge/filter/remove"
+    _TARGETS: Dict[str, str] = {"DST": "dst",
+                                "SRC": "src"}
 
     def __init__(self, ip_address: str, user: str, password: str) -> None:
         self._ip_address: str = ip_address
         self._password: str = password
         self._user: str = user
-        self._router: ros_api.Api = ros_api.Api(self._ip_address, user=self._user, password=self._password,
-                                                timeout=self.TIMEOUT)
+        self._router: "ros_api.Api" = self._connect()
+        self._filter_indices: Optional[Dict[Tuple[str, str], List[int]]] = None
+        self._total_statistics: Optional[List[FilterData]] = None
+
+    def _connect(self) -> "ros_api.Api":
+        """
+        Method opens connection to router.
+        :return: API object connected to router.
+        """
+
+        import ros_api
+
+        return ros_api.Api(self._ip_address, user=self._user, password=self._password, timeout=self.TIMEOUT)
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _decode_text(raw_text: str) -> str:
         """
         Method correctly decodes the text from the router containing Cyrillic characters.
@@ -28,8 +77,10 @@ class MikroTikRouter:
 
         decoded_text = raw_text
         if raw_text:
-            initial_bytes = eval(f'b"{raw_text}"')
-            encoding = chardet.detect(initial_bytes)["encoding"]
+            initial_bytes = codecs.escape_decode(raw_text.encode("utf-8", "backslashreplace"))[0]
+            if initial_bytes.isascii():
+                return initial_bytes.decode("ascii")
+            encoding = _detect_encoding(initial_bytes)
             try:
                 decoded_text = initial_bytes.decode(encoding)
             except Exception:
@@ -37,6 +88,7 @@ class MikroTikRouter:
         return decoded_text
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _encode_text(raw_text: str) -> str:
         """
         Method correctly encodes text containing Cyrillic characters to send this
@@ -49,43 +101,77 @@ class MikroTikRouter:
         return repr(initial_bytes)[2:-1]
 
     @staticmethod
-    def _get_mac_and_target(item: Dict[str, str]) -> Dict[str, str]:
+    def _get_mac_and_target(item: Dict[str, str]) -> Tuple[str, str]:
         """
         Method returns MAC address and target (SRC or DST) of given filter.
         :param item: data for given filter from router.
-        :return: dictionary with MAC address and target (SRC or DST).
-        """
-
-        src_mac = item.get("src-mac-address", None)
-        dst_mac = item.get("dst-mac-address", None)
-        if src_mac is not None:
-            data = {"mac": src_mac.split("/")[0].upper(),
-                    "target": "SRC"}
-        elif dst_mac is not None:
-            data = {"mac": dst_mac.split("/")[0].upper(),
-                    "target": "DST"}
-        else:
-            data = {"mac": "",
-                    "target": ""}
-        return data
-
-    def _get_total_statistics(self) -> List[Dict[str, str]]:
-        """
-        Method gets filter statistics from router.
-        :return: list of dictionaries with MAC address of filter, target of filter, state of filter
-        and comment.
-        """
-
-        result = self._router.talk("/interface/bridge/filter/print")
-        statistics = []
-        for item in result:
-            data = {"action": item.get("action", ""),
-                    "disabled": item.get("disabled", ""),
-                    "comment": self._decode_text(item.get("comment", ""))}
-            data.update(**self._get_mac_and_target(item))
-            statistics.append(data)
+        :return: MAC address and target (SRC or DST).
+        """
+
+        mac = item.get("src-mac-address", None)
+        target = "SRC"
+        if mac is None:
+            mac = item.get("dst-mac-address", None)
+            target = "DST"
+        if mac is None:
+            return "", ""
+        return mac.partition("/")[0].upper(), target
+
+    def _get_filter_indices(self) -> Dict[Tuple[str, str], List[int]]:
+        """
+        Method returns indices of filters in router for each MAC address and target. Indices are collected once for
+        received statistics.
+        :return: dictionary with indices of filters.
+        """
+
+        if self._filter_indices is None:
+            filter_indices = {}
+            for index, filter_data in enumerate(self._get_total_statistics()):
+                filter_indices.setdefault((filter_data.mac, filter_data.target), []).append(index)
+            self._filter_indices = filter_indices
+        return self._filter_indices
+
+    def _get_total_statistics(self) -> List[FilterData]:
+        """
+        Method gets filter statistics from router. Statistics are received from router once and then are taken from
+        cache until filters on router are changed.
+        :return: list with action, state, comment, MAC address and target of each filter. Comment is not decoded,
+        because only statistics for GUI need it.
+        """
+
+        if self._total_statistics is not None:
+            return self._total_statistics
+        try:
+            result = self._router.talk(self._PRINT_COMMAND)
+        except OSError:
+            logging.warning("Connection to router %s was lost, reconnecting", self._ip_address)
+            self._reconnect()
+            result = self._router.talk(self._PRINT_COMMAND)
+        get_mac_and_target = self._get_mac_and_target
+        statistics = [FilterData(item.get("action", ""), item.get("disabled", ""), item.get("comment", ""),
+                                 *get_mac_and_target(item)) for item in result]
+        self._total_statistics = statistics
         return statistics
 
+    def _reconnect(self) -> None:
+        """
+        Method opens new connection to router instead of lost one.
+        """
+
+        try:
+            self._router.close()
+        except Exception:
+            pass
+        self._router = self._connect()
+
+    def _reset_statistics(self) -> None:
+        """
+        Method drops received filter statistics, so they will be received from router again.
+        """
+
+        self._filter_indices = None
+        self._total_statistics = None
+
     def add_comment(self, mac_address: str, target: str, comment: str) -> bool:
         """
         Method adds comment to filter.
@@ -95,32 +181,68 @@ class MikroTikRouter:
         :return: True if comment was added.
         """
 
-        indices = []
-        for index, filter_data in enumerate(self._get_total_statistics()):
-            if filter_data["mac"] == mac_address and filter_data["target"] == target:
-                indices.append(str(index))
+        indices = self._get_filter_indices().get((mac_address, target), None)
         if indices:
-            self._router.talk(("/interface/bridge/filter/comment", f"=comment={self._encode_text(comment)}",
-                               f"=numbers={','.join(indices)}"))
+            self._reset_statistics()
+            self._router.talk((self._COMMENT_COMMAND, f"=comment={self._encode_text(comment)}",
+                               f"=numbers={','.join(map(str, indices))}"))
             return True
         return False
 
-    def add_filter(self, mac_address: str, target: str, comment: str, state: Optional[str] = "false") -> None:
+    def add_filter(self, mac_address: str, target: str, comment: str, state: Optional[str] = "false",
+                   place_before: Optional[int] = None) -> None:
         """
         Method adds new filter to router.
         :param mac_address: MAC address of filter;
         :param target: target (SRC or DST) of filter;
         :param comment: comment for filter;
-        :param state: required filter state (enabled or disabled).
+        :param state: required filter state (enabled or disabled);
+        :param place_before: index of filter before which new filter should be placed. If None, new filter is added
+        to the end of list.
         """
 
+        self._reset_statistics()
+        command = (*self._ADD_COMMAND, f"=disabled={state}",
+                   f"={self._TARGETS[target]}-mac-address={mac_address}/FF:FF:FF:FF:FF:FF")
         if comment:
-            self._router.talk(("/interface/bridge/filter/add", "=action=accept", "=chain=forward", f"=disabled={state}",
-                               f"={target.lower()}-mac-address={mac_address}/FF:FF:FF:FF:FF:FF",
-                               f"=comment={self._encode_text(comment)}"))
-        else:
-            self._router.talk(f"/interface/bridge/filter/add\n=action=accept\n=chain=forward\n=disabled={state}"
-                              f"\n={target.lower()}-mac-address={mac_address}/FF:FF:FF:FF:FF:FF")
+            command += (f"=comment={self._encode_text(comment)}",)
+        if place_before is not None:
+            command += (f"=place-before={place_before}",)
+        self._router.talk(command)
+
+    def add_filter_before_drops(self, mac_address: str, target: str, comment: str) -> None:
+        """
+        Method adds new enabled filter to router before the first drop filter with one command. Position of drop
+        filters is taken from statistics received before adding, and new filter is put into these statistics, so
+        router is not asked for filters again.
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment for filter.
+        """
+
+        statistics = list(self._get_total_statistics())
+        drop_index = next((index for index, filter_data in enumerate(statistics) if filter_data.action == "drop"),
+                          None)
+        self.add_filter(mac_address, target, comment, place_before=drop_index)
+        filter_data = FilterData("accept", "false", self._encode_text(comment) if comment else "", mac_address.upper(),
+                                 target)
+        statistics.insert(len(statistics) if drop_index is None else drop_index, filter_data)
+        self._total_statistics = statistics
+        self._filter_indices = None
+
+    def check_connection(self) -> bool:
+        """
+        Method checks that connection to router is still alive. Filter statistics are received from router again, so
+        they are up to date for next operations.
+        :return: True if connection is alive.
+        """
+
+        self._reset_statistics()
+        try:
+            self._get_total_statistics()
+        except Exception:
+            return False
+        return True
 
     def close(self) -> None:
         """
@@ -137,14 +259,12 @@ class MikroTikRouter:
         :return: True if filter is removed.
         """
 
-        statistics = self._get_total_statistics()
-        statistics.reverse()
-        filter_was_deleted = False
-        for index, filter_data in enumerate(statistics):
-            if filter_data["mac"] == mac_address and filter_data["target"] == target:
-                self._router.talk(f"/interface/bridge/filter/remove\n=numbers={len(statistics) - index - 1}")
-                filter_was_deleted = True
-        return filter_was_deleted
+        indices = self._get_filter_indices().get((mac_address, target), None)
+        if not indices:
+            return False
+        self._reset_statistics()
+        self._router.talk((self._REMOVE_COMMAND, f"=numbers={','.join(map(str, indices))}"))
+        return True
 
     def enable_filter(self, mac_address: str, target: str, state: str) -> bool:
         """
@@ -155,11 +275,25 @@ class MikroTikRouter:
         :return: True if filter was enabled or disabled.
         """
 
-        for index, filter_data in enumerate(self._get_total_statistics()):
-            if filter_data["mac"] == mac_address and filter_data["target"] == target:
-                self._router.talk(f"/interface/bridge/filter/{state}\n=numbers={index}")
-                return True
-        return False
+        indices = self._get_filter_indices().get((mac_address, target), None)
+        if not indices:
+            return False
+        self._reset_statistics()
+        self._router.talk((self._ENABLE_COMMAND.format(state), f"=numbers={indices[0]}"))
+        return True
+
+    def get_filter_state(self, mac_address: str, target: str) -> Optional[str]:
+        """
+        Method returns state of filter on router.
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter.
+        :return: "true" if filter is disabled, "false" if filter is enabled, None if there is no filter.
+        """
+
+        indices = self._get_filter_indices().get((mac_address, target), None)
+        if not indices:
+            return None
+        return self._get_total_statistics()[indices[0]].disabled
 
     def get_indices_of_drop_filters(self) -> List[int]:
         """
@@ -169,7 +303,7 @@ class MikroTikRouter:
 
         indices = []
         for filter_index, filter_data in enumerate(self._get_total_statistics()):
-            if filter_data["action"] == "drop":
+            if filter_data.action == "drop":
                 indices.append(filter_index)
         return indices
 
@@ -181,11 +315,7 @@ class MikroTikRouter:
         :return: lists of indices of filters.
         """
 
-        indices = []
-        for filter_index, filter_data in enumerate(self._get_total_statistics()):
-            if filter_data["mac"] == mac_address and filter_data["target"] == target:
-                indices.append(filter_index)
-        return indices
+        return list(self._get_filter_indices().get((mac_address, target), []))
 
     def get_statistics(self) -> Dict[Tuple[str, str], Dict[str, str]]:
         """
@@ -193,18 +323,20 @@ class MikroTikRouter:
         :return: list with filter statistics.
         """
 
+        total_statistics = self._get_total_statistics()
         statistics = {}
-        multiple_filters = set()
-        for filter_data in self._get_total_statistics():
-            if not filter_data["target"]:
+        multiple_filters = []
+        for (mac, target), indices in self._get_filter_indices().items():
+            if not target:
                 continue
-            if (filter_data["mac"], filter_data["target"]) not in statistics:
-                statistics[(filter_data["mac"], filter_data["target"])] = {"comment": filter_data["comment"],
-                                                                           "disabled": filter_data["disabled"]}
-            else:
-                multiple_filters.add((filter_data["mac"], filter_data["target"]))
-        for mac, target in multiple_filters:
-            logging.warning("There are several filters %s %s in the router %s", mac, target.upper(), self._ip_address)
+            filter_data = total_statistics[indices[0]]
+            statistics[(mac, target)] = {"comment": self._decode_text(filter_data.comment),
+                                         "disabled": filter_data.disabled}
+            if len(indices) > 1:
+                multiple_filters.append(f"{mac} {target}")
+        if multiple_filters:
+            logging.warning("There are several filters %s in the router %s", ", ".join(multiple_filters),
+                            self._ip_address)
         return statistics
 
     def move_filter(self, index_from: int, index_to: int) -> None:
@@ -214,4 +346,5 @@ class MikroTikRouter:
         :param index_to: position index where to move filter.
         """
 
-        self._router.talk(f"/interface/bridge/filter/move\n=destination={index_to}\n=numbers={index_from}")
+        self._reset_statistics()
+        self._router.talk((self._MOVE_COMMAND, f"=destination={index_to}", f"=numbers={index_from}"))
@@ -1,7 +1,10 @@
+import bisect
 import ipaddress
 import logging
-from typing import Dict, List, Optional, Tuple
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QThread
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QThread, QTimer
 from mikrotik.config_data import read_config_file, save_config_file
 from mikrotik.mikrotik import MikroTikRouter
 
@@ -11,51 +14,72 @@ class Routers(QThread):
     Class to work with MikroTik routers.
     """
 
+    BATCH_DELAY: int = 10
+    BATCH_SIZE: int = 16
+    MAX_WORKERS: int = 32
+    SAVE_DELAY: int = 500
+    SESSION_TIMEOUT: int = 30000
     data_for_dialog_window_send: pyqtSignal = pyqtSignal(dict, list)
     filter_added: pyqtSignal = pyqtSignal(str, str, str, str, str)
     router_ip_address_added: pyqtSignal = pyqtSignal()
     statistics_finished: pyqtSignal = pyqtSignal()
-    statistics_received: pyqtSignal = pyqtSignal(str, dict, bool)
+    statistics_received: pyqtSignal = pyqtSignal(list)
 
     def __init__(self) -> None:
         super().__init__()
+        self._credentials: Dict[str, Tuple[str, str]] = {}
         self._default_data: Dict[str, str] = {}
+        self._default_password: Optional[str] = None
+        self._default_user: Optional[str] = None
+        self._idle_sessions: Dict[str, MikroTikRouter] = {}
+        self._ip_address_strings: List[str] = []
+        self._ip_addresses: List[ipaddress.IPv4Address] = []
+        self._operations_timer: QTimer = QTimer(self)
+        self._operations_timer.setSingleShot(True)
+        self._operations_timer.setInterval(self.BATCH_DELAY)
+        self._operations_timer.timeout.connect(self.execute_pending_operations)
+        self._pending_operations: List[Tuple[Callable[..., None], tuple]] = []
         self._routers: List[Dict[str, str]] = []
+        self._routers_by_ip_address: Dict[str, Dict[str, str]] = {}
+        self._save_timer: QTimer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save_config_file)
+        self._sessions: Dict[str, Optional[MikroTikRouter]] = {}
+        self._sessions_timer: QTimer = QTimer(self)
+        self._sessions_timer.setSingleShot(True)
+        self._sessions_timer.setInterval(self.SESSION_TIMEOUT)
+        self._sessions_timer.timeout.connect(self.close_sessions)
 
-    def _get_user_and_password_for_router(self, router_ip_address: str) -> Tuple[Optional[str], Optional[str]]:
+    def _get_credentials(self, router: Dict[str, str]) -> Tuple[str, str]:
         """
-        Method returns user name and password for router with given IP address.
-        :param router_ip_address: IP address of router.
+        Method returns user name and password for given router. Default user name and password are used if router
+        does not have its own.
+        :param router: dictionary with router data.
         :return: user name and password for router.
         """
 
-        try:
-            ip_address = ipaddress.ip_address(router_ip_address)
-            for router in self._routers:
-                if ip_address == router.get("ip_address", None):
-                    return (router["user"] if router["user"] is not None else self._default_data["user"],
-                            router["password"] if router["password"] is not None else self._default_data["password"])
-        except Exception:
-            pass
-        logging.error("Failed to get user name and password for router %s", router_ip_address)
-        raise ValueError
+        user = router.get("user", None)
+        password = router.get("password", None)
+        return (user if user is not None else self._default_user,
+                password if password is not None else self._default_password)
 
-    def _is_there_already_router(self, ip_address: ipaddress.IPv4Address) -> bool:
+    def _get_user_and_password_for_router(self, router_ip_address: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        Method check if there is already given IP address.
-        :param ip_address: IP address of router.
-        :return: True if given IP address already exists.
+        Method returns user name and password for router with given IP address.
+        :param router_ip_address: IP address of router.
+        :return: user name and password for router.
         """
 
-        for router in self._routers:
-            if ip_address == router.get("ip_address", None):
-                return True
-        return False
+        credentials = self._credentials.get(router_ip_address)
+        if credentials is None:
+            logging.error("Failed to get user name and password for router %s", router_ip_address)
+            raise ValueError(f"Unknown router {router_ip_address}")
+        return credentials
 
-    @pyqtSlot(str, str, str, str)
-    def add_comment_to_filter(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
+    def _add_comment_to_filter(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
         """
-        Slot adds comment to given filter on given router.
+        Method adds comment to given filter on given router.
         :param router_ip_address: router IP address;
         :param mac_address: MAC address of filter;
         :param target: target (SRC or DST) of filter;
@@ -63,8 +87,7 @@ class Routers(QThread):
         """
 
         try:
-            user, password = self._get_user_and_password_for_router(router_ip_address)
-            router = MikroTikRouter(router_ip_address, user, password)
+            router = self._get_router(router_ip_address)
             router.add_comment(mac_address, target, comment)
             logging.info("Comment '%s' was added to filter %s %s on the router %s", comment, mac_address, target,
                          router_ip_address)
@@ -72,10 +95,9 @@ class Routers(QThread):
             logging.error("Comment '%s' could not be added to the filter %s %s on the router %s", comment, mac_address,
                           target, router_ip_address)
 
-    @pyqtSlot(str, str, str, str)
-    def add_filter_to_router(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
+    def _add_filter_to_router(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
         """
-        Slot adds given filter to given router.
+        Method adds given filter to given router.
         :param router_ip_address: router IP address;
         :param mac_address: MAC address of filter;
         :param target: target (SRC or DST) of filter;
@@ -83,22 +105,178 @@ class Routers(QThread):
         """
 
         try:
-            user, password = self._get_user_and_password_for_router(router_ip_address)
-            router = MikroTikRouter(router_ip_address, user, password)
-            router.add_filter(mac_address, target, comment)
-            filter_index = router.get_indices_of_filter(mac_address, target)[-1]
-            drop_indices = router.get_indices_of_drop_filters()
-            if drop_indices:
-                router.move_filter(filter_index, drop_indices[0])
+            router = self._get_router(router_ip_address)
+            router.add_filter_before_drops(mac_address, target, comment)
             disabled = "false"
             logging.info("Filter %s %s was added to router %s", mac_address, target, router_ip_address)
         except Exception:
             disabled = "-"
             logging.error("Failed to add filter %s %s to router %s", mac_address, target, router_ip_address)
-        finally:
-            self.filter_added.emit(router_ip_address, mac_address, target, comment, disabled)
-            if router is not None:
-                router.close()
+        self.filter_added.emit(router_ip_address, mac_address, target, comment, disabled)
+
+    def _add_operation(self, operation: Callable[..., None], *args) -> None:
+        """
+        Method adds operation on router to batch. Batch is executed when timer expires or batch is full.
+        :param operation: method to execute;
+        :param args: arguments for method.
+        """
+
+        self._pending_operations.append((operation, args))
+        if len(self._pending_operations) >= self.BATCH_SIZE:
+            self.execute_pending_operations()
+        elif not self._operations_timer.isActive():
+            self._operations_timer.start()
+
+    def _change_filter_state(self, router_ip_address: str, mac_address: str, target: str, comment: str, state: str
+                             ) -> None:
+        """
+        Method changes filter state on router with given IP address.
+        :param router_ip_address: router IP address;
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment fot filter;
+        :param state: new state of filter.
+        """
+
+        router = None
+        try:
+            router = self._get_router(router_ip_address)
+            if not router.enable_filter(mac_address, target, state):
+                state = {"enable": "false",
+                         "disable": "true"}.get(state, "")
+                router.add_filter(mac_address, target, comment, state)
+            logging.info("Filter %s %s state on the router %s was changed", mac_address, target, router_ip_address)
+        except Exception:
+            try:
+                disabled = router.get_filter_state(mac_address, target) if router else None
+            except Exception:
+                disabled = None
+            self.filter_added.emit(router_ip_address, mac_address, target, comment,
+                                   "-" if disabled is None else disabled)
+            logging.error("Failed to change filter %s %s state on the router %s", mac_address, target,
+                          router_ip_address)
+
+    def _delete_filter_from_router(self, router_ip_address: str, mac_address: str, target: str) -> None:
+        """
+        Method deletes given filter from given router.
+        :param router_ip_address: router IP address;
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter.
+        """
+
+        try:
+            router = self._get_router(router_ip_address)
+            if not router.delete_filter(mac_address, target):
+                logging.error("Failed to delete filter %s %s from router %s: filter not found", mac_address, target,
+                              router_ip_address)
+            else:
+                logging.info("Filter %s %s was deleted from router %s", mac_address, target, router_ip_address)
+        except Exception:
+            logging.error("Failed to delete filter %s %s from router %s", mac_address, target, router_ip_address)
+
+    @staticmethod
+    def _execute_operations(operations: List[Tuple[Callable[..., None], tuple]]) -> None:
+        """
+        Method executes operations on one router in order.
+        :param operations: list of operations with their arguments.
+        """
+
+        for operation, args in operations:
+            operation(*args)
+
+    def _get_router(self, router_ip_address: str) -> MikroTikRouter:
+        """
+        Method returns connection to router with given IP address. Connection is opened once for batch of operations
+        and is kept alive for next batches until it is idle for too long.
+        :param router_ip_address: IP address of router.
+        :return: router.
+        """
+
+        if router_ip_address in self._sessions:
+            router = self._sessions[router_ip_address]
+            if router is None:
+                raise ConnectionError(f"Failed to connect to router {router_ip_address}")
+            return router
+        self._sessions[router_ip_address] = None
+        router = self._idle_sessions.pop(router_ip_address, None)
+        if router is not None:
+            if router.check_connection():
+                self._sessions[router_ip_address] = router
+                return router
+            router.close()
+        user, password = self._get_user_and_password_for_router(router_ip_address)
+        router = MikroTikRouter(router_ip_address, user, password)
+        self._sessions[router_ip_address] = router
+        return router
+
+    def _get_router_statistics(self, router_ip_address: str, sessions: Dict[str, MikroTikRouter]
+                               ) -> Tuple[str, Dict[Tuple[str, str], Dict[str, str]], bool]:
+        """
+        Method receives filter statistics from router with given IP address. Connection to router left open after
+        operations is used if it is still alive, connection that worked is put back to given sessions.
+        :param router_ip_address: IP address of router;
+        :param sessions: dictionary with open connections to routers.
+        :return: IP address of router, filter statistics of router and True if failed to connect to router.
+        """
+
+        router = sessions.pop(router_ip_address, None)
+        if router is not None and not router.check_connection():
+            router.close()
+            router = None
+        if router is None:
+            try:
+                user, password = self._get_user_and_password_for_router(router_ip_address)
+                router = MikroTikRouter(router_ip_address, user, password)
+            except Exception:
+                logging.error("Failed to connect to router %s", router_ip_address)
+                return router_ip_address, {}, True
+        try:
+            statistics = router.get_statistics()
+        except Exception:
+            logging.error("Failed to receive filter statistics from router %s", router_ip_address)
+            router.close()
+            return router_ip_address, {}, True
+        sessions[router_ip_address] = router
+        return router_ip_address, statistics, False
+
+    def _index_routers(self) -> None:
+        """
+        Method updates sorted lists of IP addresses and their strings and dictionaries to find routers and their user
+        names and passwords by string with IP address. IP addresses come from GUI as strings, so they do not need to
+        be parsed again to find router. Default user name and password are taken from default data once.
+        """
+
+        self._default_user = self._default_data.get("user", None)
+        self._default_password = self._default_data.get("password", None)
+        self._ip_addresses = [router["ip_address"] for router in self._routers]
+        self._ip_address_strings = [str(ip_address) for ip_address in self._ip_addresses]
+        self._routers_by_ip_address = dict(zip(self._ip_address_strings, self._routers))
+        self._credentials = {ip_address: self._get_credentials(router)
+                             for ip_address, router in self._routers_by_ip_address.items()}
+
+    @pyqtSlot(str, str, str, str)
+    def add_comment_to_filter(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
+        """
+        Slot adds comment to given filter on given router.
+        :param router_ip_address: router IP address;
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment to add.
+        """
+
+        self._add_operation(self._add_comment_to_filter, router_ip_address, mac_address, target, comment)
+
+    @pyqtSlot(str, str, str, str)
+    def add_filter_to_router(self, router_ip_address: str, mac_address: str, target: str, comment: str) -> None:
+        """
+        Slot adds given filter to given router.
+        :param router_ip_address: router IP address;
+        :param mac_address: MAC address of filter;
+        :param target: target (SRC or DST) of filter;
+        :param comment: comment for filter.
+        """
+
+        self._add_operation(self._add_filter_to_router, router_ip_address, mac_address, target, comment)
 
     @pyqtSlot(str)
     def add_ip_address(self, ip_address: str) -> None:
@@ -112,16 +290,21 @@ class Routers(QThread):
         except ValueError:
             logging.warning("Incorrect IP address: %s", str(ip_address))
             return
-        if self._is_there_already_router(ip_address):
+        if str(ip_address) in self._routers_by_ip_address:
             logging.warning("Router with IP address %s already exists", str(ip_address))
             return
-        self._routers.append({"ip_address": ip_address,
-                              "user": None,
-                              "password": None})
-        self._routers = sorted(self._routers, key=lambda x: x["ip_address"])
+        router = {"ip_address": ip_address,
+                  "user": None,
+                  "password": None}
+        index = bisect.bisect_left(self._ip_addresses, ip_address)
+        self._ip_addresses.insert(index, ip_address)
+        self._ip_address_strings.insert(index, str(ip_address))
+        self._routers.insert(index, router)
+        self._routers_by_ip_address[str(ip_address)] = router
+        self._credentials[str(ip_address)] = self._get_credentials(router)
         self.router_ip_address_added.emit()
         logging.info("Added IP address %s", str(ip_address))
-        self.save_config_file()
+        self._save_timer.start()
 
     @pyqtSlot(str, str, str, str, str)
     def change_filter_state(self, router_ip_address: str, mac_address: str, target: str, comment: str, state: str
@@ -135,26 +318,21 @@ class Routers(QThread):
         :param state: new state of filter.
         """
 
-        try:
-            user, password = self._get_user_and_password_for_router(router_ip_address)
-            router = MikroTikRouter(router_ip_address, user, password)
-            if not router.enable_filter(mac_address, target, state):
-                state = {"enable": "false",
-                         "disable": "true"}.get(state, "")
-                router.add_filter(mac_address, target, comment, state)
-            logging.info("Filter %s %s state on the router %s was changed", mac_address, target, router_ip_address)
-        except Exception:
-            if router:
-                statistics = router.get_statistics()
-                disabled = statistics.get((mac_address, target), {}).get("disabled", "-")
-            else:
-                disabled = "-"
-            self.filter_added.emit(router_ip_address, mac_address, target, comment, disabled)
-            logging.error("Failed to change filter %s %s state on the router %s", mac_address, target,
-                          router_ip_address)
-        finally:
-            if router is not None:
+        self._add_operation(self._change_filter_state, router_ip_address, mac_address, target, comment, state)
+
+    @pyqtSlot()
+    def close_sessions(self) -> None:
+        """
+        Slot closes connections to routers left open after operations.
+        """
+
+        self._sessions_timer.stop()
+        for router in self._idle_sessions.values():
+            try:
                 router.close()
+            except Exception:
+                pass
+        self._idle_sessions.clear()
 
     @pyqtSlot()
     def collect_data_for_dialog_window(self) -> None:
@@ -173,19 +351,7 @@ class Routers(QThread):
         :param target: target (SRC or DST) of filter.
         """
 
-        try:
-            user, password = self._get_user_and_password_for_router(router_ip_address)
-            router = MikroTikRouter(router_ip_address, user, password)
-            if not router.delete_filter(mac_address, target):
-                logging.error("Failed to delete filter %s %s from router %s: filter not found", mac_address, target,
-                              router_ip_address)
-            else:
-                logging.info("Filter %s %s was deleted from router %s", mac_address, target, router_ip_address)
-        except Exception:
-            logging.error("Failed to delete filter %s %s from router %s", mac_address, target, router_ip_address)
-        finally:
-            if router is not None:
-                router.close()
+        self._add_operation(self._delete_filter_from_router, router_ip_address, mac_address, target)
 
     @pyqtSlot(str)
     def delete_router(self, router_ip_address: str) -> None:
@@ -195,53 +361,84 @@ class Routers(QThread):
         """
 
         try:
-            ip_address = ipaddress.ip_address(router_ip_address)
-            router_index = None
-            for index, router in enumerate(self._routers):
-                if router.get("ip_address") == ip_address:
-                    router_index = index
-            if router_index is not None:
-                self._routers.pop(router_index)
+            router = self._routers_by_ip_address.pop(router_ip_address, None)
+            self._credentials.pop(router_ip_address, None)
+            if router is not None:
+                session = self._idle_sessions.pop(router_ip_address, None)
+                if session is not None:
+                    session.close()
+                index = bisect.bisect_left(self._ip_addresses, router["ip_address"])
+                del self._ip_addresses[index]
+                del self._ip_address_strings[index]
+                del self._routers[index]
             logging.info("Router %s was deleted", router_ip_address)
         except Exception:
             logging.error("Failed to delete router %s", router_ip_address)
         else:
-            self.save_config_file()
+            self._save_timer.start()
+
+    @pyqtSlot()
+    def execute_pending_operations(self) -> None:
+        """
+        Slot executes all collected operations on routers. Operations on different routers are executed in parallel,
+        operations on one router are executed in order. Connection to each router is opened once for all operations
+        on this router and then is left open for next operations.
+        """
+
+        self._operations_timer.stop()
+        operations_by_routers = {}
+        for operation, args in self._pending_operations:
+            operations_by_routers.setdefault(args[0], []).append((operation, args))
+        self._pending_operations = []
+        if not operations_by_routers:
+            return
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(operations_by_routers))) as executor:
+                for _ in executor.map(self._execute_operations, operations_by_routers.values()):
+                    pass
+        finally:
+            for router_ip_address, router in self._sessions.items():
+                if router is not None:
+                    self._idle_sessions[router_ip_address] = router
+            self._sessions.clear()
+            if self._idle_sessions:
+                self._sessions_timer.start()
 
     @pyqtSlot()
     def get_statistics(self) -> None:
         """
-        Slot receives filter statistics from all known routers.
+        Slot receives filter statistics from all known routers. Routers are polled in parallel, statistics of all
+        routers are sent with one signal in order of routers. Connections to routers are left open for next operations.
         """
 
-        for router in self._routers:
-            router_ip_address = str(router.get("ip_address", None))
-            statistics = {}
-            bad_router = False
-            try:
-                user, password = self._get_user_and_password_for_router(router_ip_address)
-                router = MikroTikRouter(router_ip_address, user, password)
-            except Exception:
-                bad_router = True
-                logging.error("Failed to connect to router %s", router_ip_address)
-            if not bad_router:
-                try:
-                    statistics = router.get_statistics()
-                except Exception:
-                    bad_router = True
-                    logging.error("Failed to receive filter statistics from router %s", router_ip_address)
-                finally:
-                    router.close()
-            self.statistics_received.emit(router_ip_address, statistics, bad_router)
+        self.execute_pending_operations()
+        router_ip_addresses = list(self._ip_address_strings)
+        if router_ip_addresses:
+            sessions = self._idle_sessions
+            self._idle_sessions = {}
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(router_ip_addresses))) as executor:
+                statistics = list(executor.map(lambda ip_address: self._get_router_statistics(ip_address, sessions),
+                                               router_ip_addresses))
+            self._idle_sessions = sessions
+            self.statistics_received.emit(statistics)
+            if sessions:
+                self._sessions_timer.start()
         self.statistics_finished.emit()
 
     @pyqtSlot()
     def read_config_file(self) -> None:
         self._default_data, self._routers = read_config_file()
+        self._index_routers()
         self.get_statistics()
 
     @pyqtSlot()
     def save_config_file(self) -> None:
+        """
+        Slot saves routers data to config file. Changes of routers data are saved with delay, so several changes in a
+        row are written to file once.
+        """
+
+        self._save_timer.stop()
         save_config_file(self._default_data, self._routers)
 
     @pyqtSlot(dict, list)
@@ -253,7 +450,10 @@ class Routers(QThread):
         :param new_routers_data: list with new routers data.
         """
 
+        self.close_sessions()
         self._default_data = new_default_data
         self._routers = new_routers_data
+        self._routers.sort(key=itemgetter("ip_address"))
+        self._index_routers()
         logging.info("New parameters were set for routers")
-        self.save_config_file()
+        self._save_timer.start()